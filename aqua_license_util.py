@@ -10,47 +10,388 @@ Usage:
     python aqua_license_util.py license breakdown      # Show per-scope breakdown (JSON)
 """
 
-import argparse
+import functools
 import json
 import sys
 import os
-from prettytable import PrettyTable
-
-# Import from aquasec library
-from aquasec import (
-    authenticate,
-    get_all_licenses,
-    get_licences,
-    get_app_scopes,
-    get_repo_count_by_scope,
-    get_enforcer_count_by_scope,
-    get_code_repo_count_by_scope,
-    get_function_count,
-    api_get_dta_license,
-    api_post_dta_license_utilization,
-    write_json_to_file,
-    generate_csv_for_license_breakdown,
-    load_profile_credentials,
-    interactive_setup,
-    list_profiles,
-    ConfigManager,
-    get_profile_info,
-    get_all_profiles_info,
-    format_profile_info,
-    delete_profile_with_result,
-    set_default_profile_with_result,
-    profile_not_found_response,
-    profile_operation_response
-)
+import threading
+import time
+from operator import itemgetter
 
 # Version
 __version__ = "0.4.0"
 
+# license show table: (active_production field, display name)
+_SHOW_FIELDS = (
+    ('num_repositories', 'Image Repositories'),
+    ('num_microenforcers', 'Micro-enforcers'),
+    ('num_vm_enforcers', 'VM Enforcers'),
+    ('num_functions', 'Functions'),
+    ('num_code_repositories', 'Code Repositories'),
+    ('num_advanced_functions', 'Advanced Functions'),
+    ('num_protected_kube_nodes', 'Protected K8s Nodes'),
+    ('vshield', 'vShield'),
+    ('malware_protection', 'Malware Protection')
+)
+_YES_NO_FIELDS = frozenset({'vshield', 'malware_protection'})
+_SHOW_HEADERS = ("Product", "Total Limit")
+
+# license count table: (usage key, license limit key, display name) - all resources are
+# shown for renewal/usage tracking, a None limit key means unlimited
+_COUNT_RESOURCES = (
+    ('repositories', 'num_repositories', 'Image Repositories'),
+    ('code_repositories', 'num_code_repositories', 'Code Repositories'),
+    ('enforcers', 'num_protected_kube_nodes', 'Aqua Enforcers'),
+    ('kube_enforcers', None, 'Kube Enforcers'),
+    ('micro_enforcers', 'num_microenforcers', 'Micro Enforcers'),
+    ('vm_enforcers', 'num_vm_enforcers', 'VM Enforcers'),
+    ('functions', 'num_functions', 'Functions')
+)
+_COUNT_HEADERS = ("Resource", "Limit", "Used", "Utilization %")
+
+# license count: license limits covering each usage total; usage is only fetched in JSON
+# mode when at least one of them is not unlimited
+_USAGE_LIMIT_KEYS = {
+    'repositories': ('num_repositories',),
+    'code_repositories': ('num_code_repositories',),
+    'functions': ('num_functions',),
+    'enforcers': ('num_protected_kube_nodes', 'num_microenforcers', 'num_vm_enforcers')
+}
+
+# enforcer types reported by the aquasec enforcer counts, in breakdown table column order
+_ENFORCER_TYPES = ('agent', 'kube_enforcer', 'host_enforcer', 'micro_enforcer', 'nano_enforcer', 'pod_enforcer')
+_get_enforcer_counts = itemgetter(*_ENFORCER_TYPES)
+
+# license breakdown table
+_BREAKDOWN_HEADERS = ("Scope", "Images", "Code", "Agents", "Kube", "Host", "Micro", "Nano", "Pod")
+
+# active_production fields reported as-is even when -1
+_NEVER_UNLIMITED = frozenset({'dta_repos'})
+
+# Defaults for options accepted before or after any command
+_GLOBAL_DEFAULTS = {
+    'verbose': False,
+    'debug': False,
+    'profile': 'default',
+    'pretty': False,
+    'no_cache': False,
+    'refresh': False
+}
+
+# Responses of license/scope lookups for this process, keyed by (function, server, token digest)
+_response_cache = {}
+_cache_enabled = True
+
+# Per-scope requests allowed in flight at once across all fan-outs, to avoid flooding the API
+_MAX_SCOPE_REQUESTS = 16
+_scope_request_slots = threading.BoundedSemaphore(_MAX_SCOPE_REQUESTS)
+
+# On-disk caches: an encrypted authentication token per profile, reused until shortly
+# before it expires, and the scope list per profile, reused for a few minutes
+_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.aqua')
+_TOKEN_EXPIRY_MARGIN = 60
+_SCOPES_CACHE_TTL = 300
+
+# Set once urllib3 SSL warnings have been disabled
+_http_configured = False
+
+
+def _cached(fn, server, token, debug=False):
+    """Call fn(server, token, debug), reusing an earlier response for the same server and token
+
+    The token is keyed by its digest so raw tokens are never stored as cache keys.
+    """
+    if not _cache_enabled:
+        return fn(server, token, debug)
+
+    import hashlib
+    token_hash = hashlib.blake2b(str(token).encode()).hexdigest()[:16]
+    key = (fn.__name__, server, token_hash)
+    if key not in _response_cache:
+        result = fn(server, token, debug)
+        if result is None:
+            return result
+        _response_cache[key] = result
+    return _response_cache[key]
+
+
+def _to_json_value(key, value):
+    """Report a -1 license limit as "unlimited", except for fields in _NEVER_UNLIMITED"""
+    if value == -1 and type(value) is int and key not in _NEVER_UNLIMITED:
+        return "unlimited"
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _load_orjson():
+    """Import the optional orjson encoder on first use, returning None when it is not installed"""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def _emit_json(obj, pretty=False):
+    """Write obj to stdout as JSON without first building the whole document as a string
+
+    Output is compact unless pretty is set, in which case it is indented by 2 spaces.
+    Uses orjson when it is installed and stdout exposes a binary buffer.
+    """
+    orjson = _load_orjson()
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if orjson is not None and buffer is not None:
+        sys.stdout.flush()
+        buffer.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0))
+        buffer.write(b'\n')
+        buffer.flush()
+        return
+
+    if pretty:
+        json.dump(obj, sys.stdout, indent=2)
+    else:
+        json.dump(obj, sys.stdout, separators=(',', ':'))
+    sys.stdout.write('\n')
+
+
+def _print_table(headers, rows, aligns=None):
+    """Print rows as a bordered text table
+
+    aligns holds one of "l", "r" or "c" per column, applied to the header and the rows like
+    PrettyTable does; columns are centered by default.
+    """
+    aligns = aligns or "c" * len(headers)
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max(map(len, column)) for column in zip(headers, *rows)]
+
+    justify = {'l': str.ljust, 'r': str.rjust, 'c': str.center}
+    border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+
+    def format_row(values, row_aligns):
+        cells = (justify[align](value, width) for value, width, align in zip(values, widths, row_aligns))
+        return '| ' + ' | '.join(cells) + ' |'
+
+    lines = [border, format_row(headers, aligns), border]
+    lines.extend(format_row(row, aligns) for row in rows)
+    lines.append(border)
+    print('\n'.join(lines))
+
+
+def _dumps(obj, pretty=False):
+    """Serialize obj to a JSON string, compact unless pretty, using orjson when installed"""
+    orjson = _load_orjson()
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    if pretty:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def _write_json_object(pairs, fh, pretty=False):
+    """Write (key, value) pairs to fh as a single JSON object, one entry at a time
+
+    Produces the same layout as serializing the whole dict at once, without holding it in memory.
+    """
+    fh.write('{')
+    separator = '\n  ' if pretty else ''
+    for key, value in pairs:
+        if pretty:
+            fh.write(separator + _dumps(key) + ': ' + _dumps(value, pretty).replace('\n', '\n  '))
+            separator = ',\n  '
+        else:
+            fh.write(separator + _dumps(key) + ':' + _dumps(value))
+            separator = ','
+    if pretty and separator != '\n  ':
+        fh.write('\n')
+    fh.write('}')
+
+
+def _iter_breakdown_rows(scope_keys, repo_count_by_scope, code_repo_count_by_scope, enforcer_count_by_scope):
+    """Yield (scope, row) pairs of the license breakdown, one scope at a time"""
+    for key in scope_keys:
+        yield key, {
+            "scope name": key,
+            "repos": repo_count_by_scope.get(key, 0),
+            "code_repos": code_repo_count_by_scope.get(key, 0),
+            **enforcer_count_by_scope[key]
+        }
+
+
+def _write_private_file(path, data):
+    """Write bytes to path, readable by the current user only"""
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+
+
+def _cache_path(profile, suffix):
+    """Return the cache file for profile, rejecting names that contain a path separator"""
+    if not profile or any(sep in profile for sep in (os.sep, os.altsep) if sep):
+        raise ValueError(f"Invalid profile name for caching: {profile!r}")
+    return os.path.join(_CACHE_DIR, f"{profile}{suffix}")
+
+
+def _token_cache_fernet():
+    """Return the Fernet used to encrypt cached tokens, keyed like the stored credentials"""
+    from cryptography.fernet import Fernet
+    from aquasec import ConfigManager
+    return Fernet(ConfigManager().get_key())
+
+
+def _credentials_identity():
+    """Return the credentials a cached token or scope list was fetched with"""
+    return [os.environ.get(name) for name in ('AQUA_USER', 'CSP_ENDPOINT', 'AQUA_ENDPOINT')]
+
+
+def _token_expiry(token):
+    """Return the exp claim of a JWT token, or None if it has none"""
+    import base64
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
 
-def license_show(server, token, verbose=False, debug=False):
+def _load_cached_token(profile):
+    """Return the cached token for profile if it is still valid for the current credentials"""
+    try:
+        path = _cache_path(profile, '.token')
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            cached = json.loads(_token_cache_fernet().decrypt(f.read()))
+    except Exception:
+        return None
+    if cached.get('identity') != _credentials_identity():
+        return None
+    if cached.get('exp', 0) - _TOKEN_EXPIRY_MARGIN <= time.time():
+        return None
+    return cached.get('token')
+
+
+def _save_cached_token(profile, token):
+    """Cache token for profile, encrypted; tokens without an expiry are not cached"""
+    exp = _token_expiry(token)
+    if exp is None:
+        return
+    cached = {'token': token, 'exp': exp, 'identity': _credentials_identity()}
+    try:
+        data = _token_cache_fernet().encrypt(json.dumps(cached).encode())
+        _write_private_file(_cache_path(profile, '.token'), data)
+    except Exception:
+        pass
+
+
+def _drop_cached_token(profile):
+    """Remove the cached token for profile, if any"""
+    try:
+        os.remove(_cache_path(profile, '.token'))
+    except (OSError, ValueError):
+        pass
+
+
+def _token_rejected(server, token, debug=False):
+    """Return True if the license API does not accept token
+
+    aquasec reports a rejected token by printing an error and returning no license data
+    rather than raising, so its message is kept off stdout unless debugging. A successful
+    response is cached for the command that follows.
+    """
+    import contextlib
+    import io
+    from aquasec import get_all_licenses
+    try:
+        with contextlib.nullcontext() if debug else contextlib.redirect_stdout(io.StringIO()):
+            return _cached(get_all_licenses, server, token, debug) is None
+    except Exception as e:
+        # newer aquasec versions raise instead, carrying the HTTP status
+        if getattr(e, 'status_code', None) == 401:
+            return True
+        raise
+
+
+def _load_cached_scopes(profile, server):
+    """Return the cached scope names for profile if fresh and fetched from server, else None"""
+    try:
+        path = _cache_path(profile, '.scopes.json')
+        if time.time() - os.path.getmtime(path) > _SCOPES_CACHE_TTL:
+            return None
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('server') != server or cached.get('identity') != _credentials_identity():
+        return None
+    return cached.get('scopes')
+
+
+def _save_cached_scopes(profile, server, scopes_list):
+    """Cache the scope names for profile"""
+    cached = {'server': server, 'identity': _credentials_identity(), 'scopes': scopes_list}
+    try:
+        _write_private_file(_cache_path(profile, '.scopes.json'), json.dumps(cached).encode())
+    except (OSError, ValueError):
+        pass
+
+
+def fetch_bundle(calls):
+    """Issue independent API calls concurrently as a single batch
+
+    calls is a list of (name, callable) pairs. Returns (results, errors): dicts keyed by
+    name holding each call's return value, or the exception it raised.
+    """
+    results = {}
+    errors = {}
+    if not calls:
+        return results, errors
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = {executor.submit(fn): name for name, fn in calls}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+    return results, errors
+
+
+def fetch_parallel(fn, server, token, scopes_list, debug=False):
+    """Call a per-scope count function once per scope concurrently
+
+    fn takes the same (server, token, scopes_list, debug) arguments as the
+    aquasec get_*_count_by_scope helpers and returns a dict keyed by scope.
+    Results are merged back in scopes_list order. At most _MAX_SCOPE_REQUESTS per-scope
+    calls are in flight at once, shared across concurrent fan-outs.
+    """
+    if not scopes_list:
+        return {}
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    def fetch_scope(scope):
+        with _scope_request_slots:
+            return fn(server, token, [scope], debug)
+
+    partial = {}
+    with ThreadPoolExecutor(max_workers=min(_MAX_SCOPE_REQUESTS, len(scopes_list))) as executor:
+        futures = {executor.submit(fetch_scope, scope): scope for scope in scopes_list}
+        for future in as_completed(futures):
+            partial[futures[future]] = future.result()
+
+    return {key: value for scope in scopes_list for key, value in partial[scope].items()}
+
+
+def license_show(server, token, verbose=False, debug=False, pretty=False):
     """Show license information"""
+    from aquasec import get_all_licenses
+
     # Get all licenses data
-    all_licenses_data = get_all_licenses(server, token, debug)
+    all_licenses_data = _cached(get_all_licenses, server, token, debug)
     if not all_licenses_data:
         return
     
@@ -61,63 +402,70 @@ def license_show(server, token, verbose=False, debug=False):
     if verbose:
         # Show single table with totals
         if active_production:
-            table = PrettyTable(["Product", "Total Limit"])
-            table.align["Product"] = "l"
-            table.align["Total Limit"] = "r"
-            
-            fields = [
-                ('num_repositories', 'Image Repositories'),
-                ('num_microenforcers', 'Micro-enforcers'),
-                ('num_vm_enforcers', 'VM Enforcers'),
-                ('num_functions', 'Functions'),
-                ('num_code_repositories', 'Code Repositories'),
-                ('num_advanced_functions', 'Advanced Functions'),
-                ('num_protected_kube_nodes', 'Protected K8s Nodes'),
-                ('vshield', 'vShield'),
-                ('malware_protection', 'Malware Protection')
-            ]
+            rows = []
             
-            for field, display_name in fields:
+            for field, display_name in _SHOW_FIELDS:
                 value = active_production.get(field, 0)
-                if field in ['vshield', 'malware_protection']:
+                if field in _YES_NO_FIELDS:
                     display_value = "Yes" if value else "No"
                 else:
                     display_value = "Unlimited" if value == -1 else f"{value:,}"
-                table.add_row([display_name, display_value])
+                rows.append([display_name, display_value])
             
             # Add number of active licenses
-            table.add_row(['Active Licenses', num_active])
+            rows.append(['Active Licenses', num_active])
             
             # Add DTA repos if present
             if 'dta_repos' in active_production:
-                table.add_row(['DTA Repositories', f"{active_production['dta_repos']:,}"])
+                rows.append(['DTA Repositories', f"{active_production['dta_repos']:,}"])
             
-            print(table)
+            _print_table(_SHOW_HEADERS, rows, "lr")
         else:
             print("No active production license totals found")
     else:
-        # JSON output - return only the totals
-        totals = {}
-        
-        if active_production:
-            # Copy all fields from active_production
-            for key, value in active_production.items():
-                # Convert -1 to "unlimited" for numeric fields
-                if isinstance(value, int) and value == -1 and key not in ['dta_repos']:
-                    totals[key] = "unlimited"
-                else:
-                    totals[key] = value
+        # JSON output - return only the totals, converting -1 to "unlimited" for numeric fields
+        totals = {key: _to_json_value(key, value) for key, value in active_production.items()}
         
         # Add num_active
         totals['num_active'] = num_active
         
-        print(json.dumps(totals, indent=2))
+        _emit_json(totals, pretty)
 
 
-def license_count(server, token, verbose=False, debug=False):
+def license_count(server, token, verbose=False, debug=False, pretty=False, all_usage=False):
     """Show actual license utilization totals across all scopes"""
-    # Get license limits
-    licenses = get_licences(server, token, debug)
+    from aquasec import get_licences, get_repo_count, get_function_count, get_enforcer_count
+
+    def count_code_repos():
+        # Code repository counting is not available in older aquasec versions
+        from aquasec import get_code_repo_count
+        return get_code_repo_count(server, token, verbose=debug)
+
+    def fetch_licenses():
+        return _cached(get_licences, server, token, debug)
+
+    # Usage totals are independent, so fetch them concurrently. Usage of resources whose
+    # limits are all unlimited is only collected for the table or with --all-usage
+    calls = [
+        ('repositories', lambda: get_repo_count(server, token, verbose=debug)),
+        ('code_repositories', count_code_repos),
+        ('functions', lambda: get_function_count(server, token, verbose=debug)),
+        # Enforcers are mostly unlimited but still useful for renewal purposes
+        ('enforcers', lambda: get_enforcer_count(server, token, verbose=debug))
+    ]
+    collect_all = verbose or all_usage
+    
+    # Get license limits - first when they decide which usage to skip, otherwise in the
+    # same batch as the usage totals
+    if collect_all:
+        if debug:
+            print("DEBUG: Getting total counts (using Global scope)")
+        results, errors = fetch_bundle([('licenses', fetch_licenses)] + calls)
+        if 'licenses' in errors:
+            raise errors['licenses']
+        licenses = results['licenses']
+    else:
+        licenses = fetch_licenses()
     if not licenses:
         if verbose:
             print("No license information found")
@@ -125,65 +473,55 @@ def license_count(server, token, verbose=False, debug=False):
             print(json.dumps({"error": "No license information found"}))
         return
     
-    if debug:
-        print("DEBUG: Getting total counts (using Global scope)")
-    
-    # Get total repository count using library function
-    from aquasec import get_repo_count
-    total_repos = 0
-    try:
-        total_repos = get_repo_count(server, token, verbose=debug)
+    skipped = []
+    if not collect_all:
         if debug:
+            print("DEBUG: Getting total counts (using Global scope)")
+        calls = [(name, fn) for name, fn in calls
+                 if any(licenses.get(key, 0) != -1 for key in _USAGE_LIMIT_KEYS[name])]
+        skipped = [name for name in _USAGE_LIMIT_KEYS if name not in dict(calls)]
+        if debug and skipped:
+            print(f"DEBUG: Skipping usage of unlimited resources: {', '.join(skipped)}")
+        results, errors = fetch_bundle(calls)
+    
+    # Get total repository count
+    total_repos = None if 'repositories' in skipped else results.get('repositories', 0)
+    if debug and total_repos is not None:
+        if 'repositories' in errors:
+            print(f"DEBUG: Failed to get repository count: {errors['repositories']}")
+        else:
             print(f"DEBUG: Total repositories: {total_repos}")
-    except Exception as e:
-        if debug:
-            print(f"DEBUG: Failed to get repository count: {e}")
     
     # Get code repository count
-    total_code_repos = 0
-    try:
-        from aquasec import get_code_repo_count
-        total_code_repos = get_code_repo_count(server, token, verbose=debug)
-        if debug:
+    total_code_repos = None if 'code_repositories' in skipped else results.get('code_repositories', 0)
+    if debug and total_code_repos is not None:
+        if 'code_repositories' in errors:
+            print(f"DEBUG: Code repository counting not available: {errors['code_repositories']}")
+        else:
             print(f"DEBUG: Total code repositories: {total_code_repos}")
-    except Exception as e:
-        if debug:
-            print(f"DEBUG: Code repository counting not available: {e}")
     
     # Get functions count
-    total_functions = 0
-    try:
-        total_functions = get_function_count(server, token, verbose=debug)
-        if debug:
+    total_functions = None if 'functions' in skipped else results.get('functions', 0)
+    if debug and total_functions is not None:
+        if 'functions' in errors:
+            print(f"DEBUG: Functions counting not available: {errors['functions']}")
+        else:
             print(f"DEBUG: Total functions: {total_functions}")
-    except Exception as e:
-        if debug:
-            print(f"DEBUG: Functions counting not available: {e}")
     
-    # Get enforcer counts - even though unlimited, useful for renewal purposes
-    # Use the efficient optimized method that calls direct count APIs
-    from aquasec import get_enforcer_count
-    
-    try:
-        # Get total enforcer counts using optimized direct API calls
-        total_enforcers = get_enforcer_count(server, token, verbose=debug)
-        
+    # Get enforcer counts
+    if 'enforcers' in skipped:
+        total_enforcers = dict.fromkeys(_ENFORCER_TYPES)
+    elif 'enforcers' in errors:
         if debug:
-            print(f"DEBUG: Total enforcer counts: {total_enforcers}")
-    except Exception as e:
-        if debug:
-            print(f"DEBUG: Failed to get enforcer counts: {e}")
+            print(f"DEBUG: Failed to get enforcer counts: {errors['enforcers']}")
         # Fallback to empty counts
-        total_enforcers = {
-            'agent': 0,
-            'kube_enforcer': 0,
-            'host_enforcer': 0,
-            'micro_enforcer': 0,
-            'nano_enforcer': 0,
-            'pod_enforcer': 0
-        }
+        total_enforcers = dict.fromkeys(_ENFORCER_TYPES, 0)
+    else:
+        total_enforcers = results['enforcers']
+        if debug:
+            print(f"DEBUG: Total enforcer counts: {total_enforcers}")
     
-    # Calculate utilization - include all resources even if unlimited
+    # Calculate utilization - skipped unlimited resources are reported as null
     utilization = {
         'limits': licenses,
         'usage': {
@@ -203,24 +541,9 @@ def license_count(server, token, verbose=False, debug=False):
     
     if verbose:
         # Show table with limits vs actual usage
-        table = PrettyTable(["Resource", "Limit", "Used", "Utilization %"])
-        table.align["Resource"] = "l"
-        table.align["Limit"] = "r"
-        table.align["Used"] = "r"
-        table.align["Utilization %"] = "r"
+        rows = []
         
-        # Define resource mappings - show all resources for renewal/usage tracking
-        resources = [
-            ('repositories', 'num_repositories', 'Image Repositories'),
-            ('code_repositories', 'num_code_repositories', 'Code Repositories'),
-            ('enforcers', 'num_protected_kube_nodes', 'Aqua Enforcers'),
-            ('kube_enforcers', None, 'Kube Enforcers'),
-            ('micro_enforcers', 'num_microenforcers', 'Micro Enforcers'),
-            ('vm_enforcers', 'num_vm_enforcers', 'VM Enforcers'),
-            ('functions', 'num_functions', 'Functions')
-        ]
-        
-        for usage_key, limit_key, display_name in resources:
+        for usage_key, limit_key, display_name in _COUNT_RESOURCES:
             # Handle None license key as unlimited
             if limit_key is None:
                 limit = -1
@@ -239,9 +562,9 @@ def license_count(server, token, verbose=False, debug=False):
                 else:
                     util_pct = "-"
             
-            table.add_row([display_name, limit_str, f"{used:,}", util_pct])
+            rows.append([display_name, limit_str, f"{used:,}", util_pct])
         
-        print(table)
+        _print_table(_COUNT_HEADERS, rows, "lrrr")
         
         # Show total active licenses
         print(f"\nActive Licenses: {licenses.get('num_active', 0)}")
@@ -251,76 +574,130 @@ def license_count(server, token, verbose=False, debug=False):
             print("\nNote: For detailed enforcer counts, use 'license breakdown' command")
     else:
         # JSON output
-        print(json.dumps(utilization, indent=2))
+        _emit_json(utilization, pretty)
 
 
-def license_breakdown(server, token, verbose=False, debug=False, csv_file=None, json_file=None, skip_repos=False):
+def license_breakdown(server, token, verbose=False, debug=False, csv_file=None, json_file=None, skip_repos=False,
+                      pretty=False, profile=None, refresh=False):
     """Provide license usage breakdown per application scope"""
-    # get the license information
-    licenses = get_licences(server, token, debug)
+    from aquasec import (
+        get_licences,
+        get_app_scopes,
+        get_repo_count_by_scope,
+        get_enforcer_count_by_scope,
+        get_code_repo_count_by_scope,
+        api_get_dta_license,
+        api_post_dta_license_utilization,
+        generate_csv_for_license_breakdown,
+        write_json_to_file
+    )
+
+    def fetch_dta():
+        dta_license = _cached(api_get_dta_license, server, token, debug)
+        dta_license_utilization = None
+        if dta_license["enabled"]:
+            # Only echoed in debug output, so the body is kept as text rather than parsed
+            dta_license_utilization = api_post_dta_license_utilization(server, token, dta_license["token"], dta_license["url"]).text
+        return dta_license, dta_license_utilization
+
+    def fetch_scopes():
+        # The scope list changes rarely, so it is kept on disk per profile for a few minutes
+        scopes_list = None
+        if profile is not None and not refresh:
+            scopes_list = _load_cached_scopes(profile, server)
+            if scopes_list is not None and debug:
+                print("DEBUG: Using cached scopes list")
+        if scopes_list is None:
+            scopes_list = [scope["name"] for scope in _cached(get_app_scopes, server, token, debug)]
+            if profile is not None:
+                _save_cached_scopes(profile, server, scopes_list)
+        return scopes_list
+
+    # the license information is only shown in debug output; when needed it is fetched in
+    # the same batch as the scopes since they don't depend on each other
+    calls = [('scopes', fetch_scopes)]
     if debug:
-        print("DEBUG: License info:", json.dumps(licenses), "\n")
+        calls.append(('licenses', lambda: _cached(get_licences, server, token, debug)))
+    results, errors = fetch_bundle(calls)
+    for name, _ in calls:
+        if name in errors:
+            raise errors[name]
 
-    # dta
-    dta_license = api_get_dta_license(server, token, debug)
     if debug:
-        print("DEBUG: DTA License:", dta_license)
-    
-    dta_license_utilization = None
-    if dta_license["enabled"]:
-        dta_license_utilization = api_post_dta_license_utilization(server, token, dta_license["token"], dta_license["url"]).json()
-        if debug:
-            print("DEBUG: DTA License Utilization:", dta_license_utilization, "\n")
+        print("DEBUG: License info:", _dumps(results['licenses']), "\n")
 
     # get all application scopes
-    scopes_list = []
-    scopes_result = get_app_scopes(server, token, debug)
-    for scope in scopes_result:
-        scopes_list.append(scope["name"])
+    scopes_list = results['scopes']
     if debug:
         print("DEBUG: Scopes:", scopes_list, "\n")
 
+    # fetch repo, enforcer and code repo counts as a second batch, each fanned out per scope.
+    # dta is only shown in debug output; it does not depend on the scopes, so it runs alongside them
+    calls = [('enforcers', lambda: fetch_parallel(get_enforcer_count_by_scope, server, token, scopes_list, debug))]
+    if debug:
+        calls.append(('dta', fetch_dta))
+    if not skip_repos:
+        calls.append(('repos', lambda: fetch_parallel(get_repo_count_by_scope, server, token, scopes_list, debug)))
+        if get_code_repo_count_by_scope is not None:
+            calls.append(('code_repos', lambda: fetch_parallel(get_code_repo_count_by_scope,
+                                                               server, token, scopes_list, debug)))
+    results, errors = fetch_bundle(calls)
+    for name, _ in calls:
+        if name in errors:
+            raise errors[name]
+
+    # dta
+    if debug:
+        dta_license, dta_license_utilization = results['dta']
+        print("DEBUG: DTA License:", dta_license)
+        if dta_license_utilization is not None:
+            print("DEBUG: DTA License Utilization:", dta_license_utilization, "\n")
+
     # get the count of scopes per repo
     if skip_repos:
-        repo_count_by_scope = {scope: 0 for scope in scopes_list}
+        repo_count_by_scope = {}
         if verbose:
             print("Skipping repository counting...")
         if debug:
             print("DEBUG: Repo count by scope: Skipped\n")
     else:
-        repo_count_by_scope = get_repo_count_by_scope(server, token, scopes_list, debug)
+        repo_count_by_scope = results['repos']
         if debug:
-            print("DEBUG: Repo count by scope:", json.dumps(repo_count_by_scope), "\n")
+            print("DEBUG: Repo count by scope:", _dumps(repo_count_by_scope), "\n")
 
     # get enforcers count by scope
-    enforcer_count_by_scope = get_enforcer_count_by_scope(server, token, scopes_list, debug)
+    enforcer_count_by_scope = results['enforcers']
     if debug:
-        print("DEBUG: Enforcer count by scope:", json.dumps(enforcer_count_by_scope), "\n")
+        print("DEBUG: Enforcer count by scope:", _dumps(enforcer_count_by_scope), "\n")
 
     # get code repositories count by scope
     if skip_repos:
-        code_repo_count_by_scope = {scope: 0 for scope in scopes_list}
+        code_repo_count_by_scope = {}
         if debug:
             print("DEBUG: Code repo count by scope: Skipped\n")
-    elif get_code_repo_count_by_scope is not None:
-        code_repo_count_by_scope = get_code_repo_count_by_scope(server, token, scopes_list, debug)
+    elif 'code_repos' in results:
+        code_repo_count_by_scope = results['code_repos']
         if debug:
-            print("DEBUG: Code repo count by scope:", json.dumps(code_repo_count_by_scope), "\n")
+            print("DEBUG: Code repo count by scope:", _dumps(code_repo_count_by_scope), "\n")
     else:
         code_repo_count_by_scope = {}
         if debug:
             print("DEBUG: Code repo count by scope: Not available in this version\n")
 
-    # put scopes, repos, code repos and enforcers data together
-    breakdown_data = {}
-    for key, value in repo_count_by_scope.items():
-        if key in enforcer_count_by_scope:
-            breakdown_data[key] = {
-                "scope name": key, 
-                "repos": value,
-                "code_repos": code_repo_count_by_scope.get(key, 0),
-                **enforcer_count_by_scope[key]
-            }
+    # put scopes, repos, code repos and enforcers data together, keeping the scope order.
+    # When repositories are skipped the enforcer counts alone decide which scopes are listed.
+    # Stdout output is streamed row by row; the file exports go through the library helpers,
+    # which take the merged breakdown
+    if skip_repos:
+        scope_keys = enforcer_count_by_scope
+    else:
+        scope_keys = [key for key in repo_count_by_scope if key in enforcer_count_by_scope]
+
+    def breakdown_rows():
+        return _iter_breakdown_rows(scope_keys, repo_count_by_scope, code_repo_count_by_scope,
+                                    enforcer_count_by_scope)
+
+    breakdown_data = dict(breakdown_rows()) if csv_file or json_file else None
 
     # write csv - silent unless verbose
     if csv_file:
@@ -335,118 +712,99 @@ def license_breakdown(server, token, verbose=False, debug=False, csv_file=None,
             print(f"License breakdown exported to JSON: {json_file}")
 
     if verbose:
-        # Human-readable table format
-        table = PrettyTable()
-        table.field_names = ["Scope", "Images", "Code", "Agents",
-                            "Kube", "Host", "Micro", "Nano", "Pod"]
-        
-        for scope, details in breakdown_data.items():
-            row = [details["scope name"],
-                    details["repos"],
-                    details.get("code_repos", 0),
-                    details["agent"],
-                    details["kube_enforcer"],
-                    details["host_enforcer"],
-                    details["micro_enforcer"],
-                    details["nano_enforcer"],
-                    details["pod_enforcer"]]
-            table.add_row(row)
+        # Human-readable table format, rows read straight from the counts without merging
+        rows = [
+            (key, repo_count_by_scope.get(key, 0), code_repo_count_by_scope.get(key, 0),
+             *_get_enforcer_counts(enforcer_count_by_scope[key]))
+            for key in scope_keys
+        ]
         
-        print(table)
+        _print_table(_BREAKDOWN_HEADERS, rows)
     else:
         # JSON output by default
-        print(json.dumps(breakdown_data, indent=2))
+        _write_json_object(breakdown_rows(), sys.stdout, pretty)
+        sys.stdout.write('\n')
 
 
-def main():
-    """Main function"""
-    # Disable SSL warnings
-    import urllib3
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-    
-    # Custom argument parsing to support global options anywhere
-    # First, let's identify if we have a command and extract global args
-    raw_args = sys.argv[1:]
-    
-    # Extract global arguments regardless of position
-    global_args = {
-        'verbose': False,
-        'debug': False,
-        'profile': 'default'
-    }
-    
-    # Check for version first
-    if '--version' in raw_args:
-        print(f'aqua_license_util {__version__}')
-        sys.exit(0)
-    
-    # Extract global flags from anywhere in the command line
-    filtered_args = []
-    i = 0
-    while i < len(raw_args):
-        arg = raw_args[i]
-        if arg in ['-v', '--verbose']:
-            global_args['verbose'] = True
-        elif arg in ['-d', '--debug']:
-            global_args['debug'] = True
-        elif arg in ['-p', '--profile']:
-            if i + 1 < len(raw_args):
-                global_args['profile'] = raw_args[i + 1]
-                i += 1  # Skip the profile value
-        else:
-            filtered_args.append(arg)
-        i += 1
+# (command, subcommand) -> (handler, names of extra arguments passed through as keywords)
+_DISPATCH = {
+    ('license', 'show'): (license_show, ()),
+    ('license', 'count'): (license_count, ('all_usage',)),
+    ('license', 'breakdown'): (license_breakdown, ('csv_file', 'json_file', 'skip_repos', 'profile', 'refresh'))
+}
+
+
+def build_parser():
+    """Build the command line parser
+
+    Global options live on a parent parser shared by every command and subcommand, so
+    they can be placed before or after the command. Their defaults are suppressed so a
+    subcommand does not reset a value given earlier; parse_args() fills them in.
+    """
+    import argparse
+    global_parser = argparse.ArgumentParser(add_help=False)
+    global_parser.add_argument('-v', '--verbose', action='store_true', default=argparse.SUPPRESS,
+                               help='Show human-readable output instead of JSON')
+    global_parser.add_argument('-d', '--debug', action='store_true', default=argparse.SUPPRESS,
+                               help='Show debug output including API calls')
+    global_parser.add_argument('-p', '--profile', default=argparse.SUPPRESS,
+                               help='Configuration profile to use (default: default)')
+    global_parser.add_argument('--pretty', action='store_true', default=argparse.SUPPRESS,
+                               help='Indent JSON output (compact by default)')
+    global_parser.add_argument('--no-cache', dest='no_cache', action='store_true', default=argparse.SUPPRESS,
+                               help='Always re-fetch license and scope data; implies --refresh')
+    global_parser.add_argument('--refresh', action='store_true', default=argparse.SUPPRESS,
+                               help='Ignore the cached authentication token and scopes list')
     
-    # Now parse with the filtered args
     parser = argparse.ArgumentParser(
         description='Aqua License Utility - Extract license utilization from Aqua Security platform',
         prog='aqua_license_util',
-        epilog='Global options can be placed before or after the command:\n'
-               '  -v, --verbose        Show human-readable output instead of JSON\n'
-               '  -d, --debug          Show debug output including API calls\n'
-               '  -p, --profile        Configuration profile to use (default: default)\n'
-               '  --version            Show program version',
-        formatter_class=argparse.RawDescriptionHelpFormatter
+        epilog='Global options can be placed before or after the command',
+        parents=[global_parser]
     )
+    parser.add_argument('--version', action='version', version=f'aqua_license_util {__version__}',
+                        help='Show program version')
     
     # Create subparsers for commands
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Setup command
-    setup_parser = subparsers.add_parser('setup', help='Interactive setup wizard')
+    setup_parser = subparsers.add_parser('setup', parents=[global_parser], help='Interactive setup wizard')
     setup_parser.add_argument('profile_name', nargs='?', help='Profile name to create/update (optional)')
     
     # Profile command with subcommands
-    profile_parser = subparsers.add_parser('profile', help='Manage configuration profiles')
+    profile_parser = subparsers.add_parser('profile', parents=[global_parser], help='Manage configuration profiles')
     profile_subparsers = profile_parser.add_subparsers(dest='profile_command', help='Profile management commands')
     
     # Profile list
-    profile_list_parser = profile_subparsers.add_parser('list', help='List available profiles')
+    profile_list_parser = profile_subparsers.add_parser('list', parents=[global_parser], help='List available profiles')
     
     # Profile show
-    profile_show_parser = profile_subparsers.add_parser('show', help='Show profile details')
+    profile_show_parser = profile_subparsers.add_parser('show', parents=[global_parser], help='Show profile details')
     profile_show_parser.add_argument('name', nargs='?', help='Profile name to show (defaults to current default profile)')
     
     # Profile delete
-    profile_delete_parser = profile_subparsers.add_parser('delete', help='Delete a profile')
+    profile_delete_parser = profile_subparsers.add_parser('delete', parents=[global_parser], help='Delete a profile')
     profile_delete_parser.add_argument('name', help='Profile name to delete')
     
     # Profile set-default
-    profile_default_parser = profile_subparsers.add_parser('set-default', help='Set default profile')
+    profile_default_parser = profile_subparsers.add_parser('set-default', parents=[global_parser], help='Set default profile')
     profile_default_parser.add_argument('name', help='Profile name to set as default')
     
     # License command with subcommands
-    license_parser = subparsers.add_parser('license', help='License management commands')
+    license_parser = subparsers.add_parser('license', parents=[global_parser], help='License management commands')
     license_subparsers = license_parser.add_subparsers(dest='license_command', help='License commands')
     
     # License show
-    license_show_parser = license_subparsers.add_parser('show', help='Show license information (JSON by default, use -v for table)')
+    license_show_parser = license_subparsers.add_parser('show', parents=[global_parser], help='Show license information (JSON by default, use -v for table)')
     
     # License count
-    license_count_parser = license_subparsers.add_parser('count', help='Show actual license utilization vs limits (JSON by default, use -v for table)')
+    license_count_parser = license_subparsers.add_parser('count', parents=[global_parser], help='Show actual license utilization vs limits (JSON by default, use -v for table)')
+    license_count_parser.add_argument('--all-usage', dest='all_usage', action='store_true',
+                                help='Also collect usage of unlimited resources (always on with -v)')
     
     # License breakdown
-    license_breakdown_parser = license_subparsers.add_parser('breakdown', help='Show license breakdown by application scope (JSON by default, use -v for table)')
+    license_breakdown_parser = license_subparsers.add_parser('breakdown', parents=[global_parser], help='Show license breakdown by application scope (JSON by default, use -v for table)')
     license_breakdown_parser.add_argument('--csv-file', dest='csv_file', action='store', 
                                 help='Export to CSV file')
     license_breakdown_parser.add_argument('--json-file', dest='json_file', action='store', 
@@ -454,19 +812,85 @@ def main():
     license_breakdown_parser.add_argument('--skip-repos', dest='skip_repos', action='store_true',
                                 help='Skip image and code repository counting (faster, enforcers only)')
     
-    # Parse the filtered arguments
-    args = parser.parse_args(filtered_args)
+    return parser
+
+
+def parse_args(parser, argv):
+    """Parse argv and apply defaults for global options that were not given"""
+    args = parser.parse_args(argv)
+    for name, default in _GLOBAL_DEFAULTS.items():
+        if not hasattr(args, name):
+            setattr(args, name, default)
+    return args
+
+
+def _load_aquasec():
+    """Import the aquasec library on first use
+
+    Deferred so --version and --help do not pay for the library and its dependencies.
+    """
+    import aquasec
+    return aquasec
+
+
+def _use_shared_session():
+    """Route all requests calls in this process through one pooled Session
+
+    The aquasec helpers do not take a session argument, so requests' module-level
+    request function (behind requests.get/post/...) is pointed at a shared Session.
+    Connections and TLS handshakes are then reused across calls and worker threads.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    def request(method, url, **kwargs):
+        return session.request(method=method, url=url, **kwargs)
+
+    requests.api.request = request
+    requests.request = request
+    return session
+
+
+def _configure_http_once():
+    """Disable SSL warnings and set up the shared session before the first API call, once per process"""
+    global _http_configured
+    if _http_configured:
+        return
+    import urllib3
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    _use_shared_session()
+    _http_configured = True
+
+
+def main():
+    """Main function"""
+    raw_args = sys.argv[1:]
     
-    # Add global args to the namespace
-    args.verbose = global_args['verbose']
-    args.debug = global_args['debug']
-    args.profile = global_args['profile']
+    # Check for version first
+    if '--version' in raw_args:
+        print(f'aqua_license_util {__version__}')
+        sys.exit(0)
+    
+    parser = build_parser()
+    args = parse_args(parser, raw_args)
     
     # Show help if no command provided
     if args.command is None:
         parser.print_help()
         sys.exit(1)
     
+    try:
+        aquasec = _load_aquasec()
+    except ImportError as e:
+        print(f"Missing required dependency: {e.name or e}")
+        print("Install with: pip install -r requirements.txt")
+        sys.exit(1)
+    
     # Handle setup command
     if args.command == 'setup':
         # Use positional argument if provided, otherwise fall back to -p flag
@@ -476,45 +900,46 @@ def main():
             profile_name = args.profile
         else:
             profile_name = None
-        success = interactive_setup(profile_name, debug=args.debug)
+        _configure_http_once()
+        success = aquasec.interactive_setup(profile_name, debug=args.debug)
         sys.exit(0 if success else 1)
     
     # Handle profile commands
     if args.command == 'profile':
-        config_mgr = ConfigManager()
+        config_mgr = aquasec.ConfigManager()
         
         # Handle profile list
         if args.profile_command == 'list':
             if not args.verbose:
                 # JSON output by default
-                profile_data = get_all_profiles_info()
-                print(json.dumps(profile_data, indent=2))
+                profile_data = aquasec.get_all_profiles_info()
+                _emit_json(profile_data, args.pretty)
             else:
                 # Verbose mode shows human-readable output
-                list_profiles(verbose=True)
+                aquasec.list_profiles(verbose=True)
             sys.exit(0)
         
         # Handle profile show
         elif args.profile_command == 'show':
             # If no name provided, use the default profile
             if args.name is None:
-                config_mgr = ConfigManager()
+                config_mgr = aquasec.ConfigManager()
                 profile_name = config_mgr.get_default_profile()
             else:
                 profile_name = args.name
             
-            profile_info = get_profile_info(profile_name)
+            profile_info = aquasec.get_profile_info(profile_name)
             if not profile_info:
-                print(profile_not_found_response(profile_name, 'text' if args.verbose else 'json'))
+                print(aquasec.profile_not_found_response(profile_name, 'text' if args.verbose else 'json'))
                 sys.exit(1)
             
-            print(format_profile_info(profile_info, 'text' if args.verbose else 'json'))
+            print(aquasec.format_profile_info(profile_info, 'text' if args.verbose else 'json'))
             sys.exit(0)
         
         # Handle profile delete
         elif args.profile_command == 'delete':
-            result = delete_profile_with_result(args.name)
-            print(profile_operation_response(
+            result = aquasec.delete_profile_with_result(args.name)
+            print(aquasec.profile_operation_response(
                 result['action'],
                 result['profile'],
                 result['success'],
@@ -525,8 +950,8 @@ def main():
         
         # Handle profile set-default
         elif args.profile_command == 'set-default':
-            result = set_default_profile_with_result(args.name)
-            print(profile_operation_response(
+            result = aquasec.set_default_profile_with_result(args.name)
+            print(aquasec.profile_operation_response(
                 result['action'],
                 result['profile'],
                 result['success'],
@@ -562,13 +987,16 @@ def main():
     profile_loaded = False
     actual_profile = args.profile
     if hasattr(args, 'profile'):
-        result = load_profile_credentials(args.profile)
+        result = aquasec.load_profile_credentials(args.profile)
         if isinstance(result, tuple):
             profile_loaded, actual_profile = result
         else:
             # Backward compatibility if someone is using old version
             profile_loaded = result
     
+    # Profile actually in use, also keys the on-disk token and scopes caches
+    args.profile = actual_profile
+    
     # Check if credentials are available (either from profile or environment)
     has_creds = os.environ.get('AQUA_USER')
     
@@ -589,15 +1017,31 @@ def main():
         print(f"DEBUG: Aqua License Utility version: {__version__}")
         print()
     
-    # Authenticate
-    try:
-        if profile_loaded and args.verbose:
-            print(f"Using profile: {actual_profile}")
+    # --no-cache also bypasses the on-disk token and scopes caches
+    if args.no_cache:
+        args.refresh = True
+    
+    def authenticate():
         if args.verbose:
             print("Authenticating with Aqua Security platform...")
-        token = authenticate(verbose=args.debug)
+        new_token = aquasec.authenticate(verbose=args.debug)
+        _save_cached_token(actual_profile, new_token)
         if args.verbose:
             print("Authentication successful!\n")
+        return new_token
+    
+    # Authenticate, reusing a cached token for this profile while it is still valid
+    try:
+        if profile_loaded and args.verbose:
+            print(f"Using profile: {actual_profile}")
+        _configure_http_once()
+        token = None if args.refresh else _load_cached_token(actual_profile)
+        token_from_cache = bool(token)
+        if token_from_cache:
+            if args.debug:
+                print("DEBUG: Using cached authentication token")
+        else:
+            token = authenticate()
     except Exception as e:
         if args.verbose:
             print(f"Authentication failed: {e}")
@@ -615,29 +1059,33 @@ def main():
             print(json.dumps({"error": "CSP_ENDPOINT environment variable not set"}))
         sys.exit(1)
     
+    if args.no_cache:
+        global _cache_enabled
+        _cache_enabled = False
+        _response_cache.clear()
+    
     # Execute commands
+    key = (args.command, getattr(args, 'license_command', None))
     try:
-        if args.command == 'license' and args.license_command == 'show':
+        if key in _DISPATCH:
+            handler, extra_args = _DISPATCH[key]
             # Debug: Show which endpoint we're using
             if args.debug:
                 print(f"DEBUG: Using CSP endpoint for license API: {csp_endpoint}")
                 api_endpoint = os.environ.get('AQUA_ENDPOINT')
-                if api_endpoint:
+                if api_endpoint and key == ('license', 'show'):
                     print(f"DEBUG: API endpoint available: {api_endpoint}")
             
-            license_show(csp_endpoint, token, args.verbose, args.debug)
-        elif args.command == 'license' and args.license_command == 'count':
-            # Debug: Show which endpoint we're using
-            if args.debug:
-                print(f"DEBUG: Using CSP endpoint for license API: {csp_endpoint}")
+            # The server may revoke a cached token before it expires; check it before the
+            # command runs and replace it with a fresh one if it is rejected
+            if token_from_cache and _token_rejected(csp_endpoint, token, args.debug):
+                if args.debug:
+                    print("DEBUG: Cached authentication token was rejected, re-authenticating")
+                _drop_cached_token(actual_profile)
+                token = authenticate()
             
-            license_count(csp_endpoint, token, args.verbose, args.debug)
-        elif args.command == 'license' and args.license_command == 'breakdown':
-            if args.debug:
-                print(f"DEBUG: Using CSP endpoint for license API: {csp_endpoint}")
-            
-            license_breakdown(csp_endpoint, token, args.verbose, args.debug, 
-                            args.csv_file, args.json_file, args.skip_repos)
+            extra_kwargs = {name: getattr(args, name) for name in extra_args}
+            handler(csp_endpoint, token, args.verbose, args.debug, pretty=args.pretty, **extra_kwargs)
     except KeyboardInterrupt:
         if args.verbose:
             print('\nExecution interrupted by user')
@@ -653,12 +1101,4 @@ def main():
 
 
 if __name__ == '__main__':
-    # Check for required dependencies
-    try:
-        from cryptography.fernet import Fernet
-    except ImportError:
-        print("Missing required dependency: cryptography")
-        print("Install with: pip install cryptography")
-        sys.exit(1)
-    
     main()
\ No newline at end of file
@@ -36,45 +36,190 @@ def test_version():
 
 
 def test_global_args_parsing():
-    """Test the custom argument parsing logic"""
-    # This tests the logic without actually running argparse
+    """Test that global options are accepted before or after the command"""
+    from aqua_license_util import build_parser, parse_args
     test_cases = [
         # (input_args, expected_verbose, expected_debug, expected_profile)
-        (['-v', 'show'], True, False, 'default'),
-        (['show', '-v'], True, False, 'default'),
-        (['-p', 'test', 'show'], False, False, 'test'),
-        (['show', '-p', 'test'], False, False, 'test'),
-        (['-v', '-d', '-p', 'prod', 'breakdown'], True, True, 'prod'),
-        (['breakdown', '-v', '-d', '-p', 'prod'], True, True, 'prod'),
+        (['-v', 'license', 'show'], True, False, 'default'),
+        (['license', 'show', '-v'], True, False, 'default'),
+        (['-p', 'test', 'license', 'show'], False, False, 'test'),
+        (['license', 'show', '-p', 'test'], False, False, 'test'),
+        (['license', 'show', '--profile=test'], False, False, 'test'),
+        (['-v', '-d', '-p', 'prod', 'license', 'breakdown'], True, True, 'prod'),
+        (['license', 'breakdown', '-v', '-d', '-p', 'prod'], True, True, 'prod'),
+        (['license', '-v', 'breakdown', '-d', '--skip-repos'], True, True, 'default'),
     ]
     
     for raw_args, exp_verbose, exp_debug, exp_profile in test_cases:
-        # Simulate the parsing logic from the script
-        global_args = {
-            'verbose': False,
-            'debug': False,
-            'profile': 'default'
-        }
-        
-        filtered_args = []
-        i = 0
-        while i < len(raw_args):
-            arg = raw_args[i]
-            if arg in ['-v', '--verbose']:
-                global_args['verbose'] = True
-            elif arg in ['-d', '--debug']:
-                global_args['debug'] = True
-            elif arg in ['-p', '--profile']:
-                if i + 1 < len(raw_args):
-                    global_args['profile'] = raw_args[i + 1]
-                    i += 1
-            else:
-                filtered_args.append(arg)
-            i += 1
-        
-        assert global_args['verbose'] == exp_verbose, f"Failed for {raw_args}: verbose"
-        assert global_args['debug'] == exp_debug, f"Failed for {raw_args}: debug"
-        assert global_args['profile'] == exp_profile, f"Failed for {raw_args}: profile"
+        args = parse_args(build_parser(), raw_args)
+        assert args.verbose == exp_verbose, f"Failed for {raw_args}: verbose"
+        assert args.debug == exp_debug, f"Failed for {raw_args}: debug"
+        assert args.profile == exp_profile, f"Failed for {raw_args}: profile"
+
+
+def test_import_without_aquasec():
+    """Test that the script imports without loading aquasec"""
+    import aqua_license_util
+    assert 'aquasec' not in sys.modules
+    assert aqua_license_util.__version__
+
+
+def test_print_table(capsys):
+    """Test the verbose table writer layout and alignment"""
+    from aqua_license_util import _print_table
+    _print_table(["Product", "Total Limit"], [["Functions", "1,000"], ["Active Licenses", 2]], "lr")
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "+-----------------+-------------+"
+    assert lines[1] == "| Product         | Total Limit |"
+    assert lines[3] == "| Functions       |       1,000 |"
+    assert lines[4] == "| Active Licenses |           2 |"
+    assert lines[5] == lines[0]
+
+
+def test_fetch_bundle():
+    """Test that batched calls report results and errors by name"""
+    from aqua_license_util import fetch_bundle
+
+    def fail():
+        raise ValueError("boom")
+
+    results, errors = fetch_bundle([('ok', lambda: 42), ('bad', fail)])
+    assert results == {'ok': 42}
+    assert isinstance(errors['bad'], ValueError)
+
+
+def test_fetch_parallel_keeps_scope_order():
+    """Test that per-scope results are merged back in scope order"""
+    from aqua_license_util import fetch_parallel
+
+    def count_by_scope(server, token, scopes_list, debug):
+        return {scope: len(scope) for scope in scopes_list}
+
+    scopes = ['Global', 'a', 'prod', 'dev-team']
+    result = fetch_parallel(count_by_scope, 'server', 'token', scopes)
+    assert list(result) == scopes
+    assert result['prod'] == 4
+
+
+def test_write_json_object_matches_json_dumps():
+    """Test that streamed JSON objects match serializing the whole dict"""
+    import io
+    import json
+    from aqua_license_util import _write_json_object
+    data = {'Global': {'repos': 3, 'agent': 1}, 'prod': {'repos': 0, 'agent': 2}}
+    for obj in (data, {}):
+        pretty = io.StringIO()
+        _write_json_object(obj.items(), pretty, pretty=True)
+        assert json.loads(pretty.getvalue()) == obj
+        assert pretty.getvalue() == json.dumps(obj, indent=2)
+        compact = io.StringIO()
+        _write_json_object(obj.items(), compact)
+        assert compact.getvalue() == json.dumps(obj, separators=(',', ':'))
+
+
+def test_token_expiry():
+    """Test reading the exp claim from JWT tokens"""
+    import base64
+    import json
+    from aqua_license_util import _token_expiry
+    payload = base64.urlsafe_b64encode(json.dumps({'exp': 1893456000}).encode()).decode().rstrip('=')
+    assert _token_expiry(f"header.{payload}.signature") == 1893456000
+    assert _token_expiry("not-a-jwt") is None
+    assert _token_expiry(None) is None
+
+
+def test_scopes_cache(tmp_path, monkeypatch):
+    """Test that cached scopes are only reused for the same server"""
+    import aqua_license_util
+    monkeypatch.setattr(aqua_license_util, '_CACHE_DIR', str(tmp_path))
+    aqua_license_util._save_cached_scopes('default', 'https://a', ['Global', 'prod'])
+    assert aqua_license_util._load_cached_scopes('default', 'https://a') == ['Global', 'prod']
+    assert aqua_license_util._load_cached_scopes('default', 'https://b') is None
+    assert aqua_license_util._load_cached_scopes('other', 'https://a') is None
+    aqua_license_util._save_cached_scopes('../default', 'https://a', ['Global'])
+    assert not (tmp_path.parent / 'default.scopes.json').exists()
+    assert aqua_license_util._load_cached_scopes('../default', 'https://a') is None
+
+
+def test_token_cache(tmp_path, monkeypatch):
+    """Test that cached tokens are only reused for the same credentials and before expiry"""
+    import base64
+    import json
+    import time
+    fernet = pytest.importorskip('cryptography.fernet')
+    import aqua_license_util
+    monkeypatch.setattr(aqua_license_util, '_CACHE_DIR', str(tmp_path))
+    key = fernet.Fernet.generate_key()
+    monkeypatch.setattr(aqua_license_util, '_token_cache_fernet', lambda: fernet.Fernet(key))
+    monkeypatch.setenv('AQUA_USER', 'alice')
+
+    def make_token(exp):
+        payload = base64.urlsafe_b64encode(json.dumps({'exp': exp}).encode()).decode().rstrip('=')
+        return f"header.{payload}.signature"
+
+    token = make_token(int(time.time()) + 3600)
+    aqua_license_util._save_cached_token('default', token)
+    assert token.encode() not in (tmp_path / 'default.token').read_bytes()
+    assert aqua_license_util._load_cached_token('default') == token
+    assert aqua_license_util._load_cached_token('other') is None
+
+    monkeypatch.setenv('AQUA_USER', 'bob')
+    assert aqua_license_util._load_cached_token('default') is None
+    monkeypatch.setenv('AQUA_USER', 'alice')
+
+    aqua_license_util._save_cached_token('default', make_token(int(time.time()) + aqua_license_util._TOKEN_EXPIRY_MARGIN - 1))
+    assert aqua_license_util._load_cached_token('default') is None
+
+    aqua_license_util._save_cached_token('default', token)
+    aqua_license_util._drop_cached_token('default')
+    assert aqua_license_util._load_cached_token('default') is None
+
+
+def test_license_count_skips_unlimited_usage(monkeypatch, capsys):
+    """Test that JSON output only fetches usage of limited resources unless asked for all of it"""
+    import json
+    import types
+    import aqua_license_util
+    calls = []
+
+    def counter(name, value):
+        def count(server, token, verbose=False):
+            calls.append(name)
+            return value
+        return count
+
+    enforcers = dict.fromkeys(aqua_license_util._ENFORCER_TYPES, 2)
+    aquasec = types.ModuleType('aquasec')
+    aquasec.get_licences = lambda server, token, verbose=False: {
+        'num_repositories': 10, 'num_code_repositories': -1, 'num_functions': -1,
+        'num_protected_kube_nodes': -1, 'num_microenforcers': -1, 'num_vm_enforcers': -1
+    }
+    aquasec.get_repo_count = counter('repositories', 4)
+    aquasec.get_code_repo_count = counter('code_repositories', 3)
+    aquasec.get_function_count = counter('functions', 1)
+    aquasec.get_enforcer_count = counter('enforcers', enforcers)
+    monkeypatch.setitem(sys.modules, 'aquasec', aquasec)
+    monkeypatch.setattr(aqua_license_util, '_cache_enabled', False)
+
+    aqua_license_util.license_count('https://csp', 'token')
+    usage = json.loads(capsys.readouterr().out)['usage']
+    assert calls == ['repositories']
+    assert usage['repositories'] == 4
+    assert usage['code_repositories'] is None
+    assert usage['functions'] is None
+    assert usage['enforcers'] is None and usage['protected_kube_nodes'] is None
+
+    calls.clear()
+    aqua_license_util.license_count('https://csp', 'token', all_usage=True)
+    usage = json.loads(capsys.readouterr().out)['usage']
+    assert sorted(calls) == sorted(aqua_license_util._USAGE_LIMIT_KEYS)
+    assert usage['code_repositories'] == 3 and usage['functions'] == 1
+    assert usage['enforcers'] == 2 and usage['vm_enforcers'] == 2
+
+    calls.clear()
+    aqua_license_util.license_count('https://csp', 'token', verbose=True)
+    assert sorted(calls) == sorted(aqua_license_util._USAGE_LIMIT_KEYS)
+    assert 'Unlimited' in capsys.readouterr().out
 
 
 if __name__ == '__main__':